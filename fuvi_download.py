@@ -1,7 +1,9 @@
 import os
-import time
 import re
-import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,8 +12,9 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from difflib import SequenceMatcher
-import unidecode
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from rapidfuzz import fuzz, process
+from anyascii import anyascii
 
 # === CONFIGURATION ===
 load_dotenv()
@@ -19,15 +22,59 @@ USERNAME = os.getenv("FUVI_USERNAME")
 PASSWORD = os.getenv("FUVI_PASSWORD")
 PLAYLIST_NAME = "Z"
 TRACK_LIST_FILE = "logs/missing_tracks.txt"
+ADDED_TRACKS_FILE = "logs/added_tracks.txt"
+NOT_FOUND_TRACKS_FILE = "logs/not_found_tracks.txt"
 FUVI_URL = "https://music.fuvi-clan.com"
-CONFIDENCE_THRESHOLD = 0.85
+CONFIDENCE_THRESHOLD = 85
+EARLY_ACCEPT_SCORE = 97  # Stop reading further search results once one scores this high
+WORKERS = 4  # Parallel headless browser sessions used to search and add tracks
+# Query parameter that makes /dashboard/library run a search (e.g. "q"), if the site supports one.
+# When set, each search is a single page load instead of typing into the search box; None types.
+SEARCH_URL_PARAM = None
+
+# === PAGE LOCATORS ===
+# CSS selectors where no text matching is needed: the browser resolves them faster than XPath.
+# [class*=...] keeps the substring semantics of the former contains(@class, ...) XPaths.
+SEARCH_INPUT_LOCATOR = (By.ID, "topbar-search")
+ROW_LOCATOR = (By.CSS_SELECTOR, "div[role='rowgroup'][class*='w-full'] > div[role='row']")
+RESULT_TITLE_LOCATOR = (By.CSS_SELECTOR, "span[class*='h3'] a")
+RESULT_ARTISTS_LOCATOR = (By.CSS_SELECTOR, "ul[class*='list_virgule'] a")
+ADD_MP3_BUTTON_LOCATOR = (By.CSS_SELECTOR, "button[aria-label*='Ajouter'][aria-label*='MP3']")
+MODAL_LOCATOR = (By.CSS_SELECTOR, "div[class*='modal']")
+PLAYLIST_ITEM_LOCATOR = (By.CSS_SELECTOR, "li[class*='cursor-pointer']")
+DOWNLOAD_LISTS_LINK_LOCATOR = (By.CSS_SELECTOR, "a[href*='/dashboard/download-lists']")
 
 # === DRIVER SETUP ===
-def create_driver():
+def create_driver(headless=False):
     options = Options()
     options.add_argument("--start-maximized")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
     return webdriver.Chrome(options=options)
 
+_session_pool = queue.Queue()
+_session_drivers = []
+
+def start_session_drivers(count):
+    """
+    Opens `count` logged-in headless sessions for the workers to share.
+    Runs on the main thread, so a failed browser launch or login stops the run before any track is processed.
+    """
+    for _ in range(count):
+        driver = create_driver(headless=True)
+        login(driver)  # Quits the driver and exits on failure
+        _session_drivers.append(driver)
+        open_library(driver)
+        _session_pool.put(driver)
+
+def quit_session_drivers():
+    """Closes every worker session browser."""
+    for driver in _session_drivers:
+        driver.quit()
+    _session_drivers.clear()
+
 # === LOGIN ===
 def login(driver):
     """Logs into FuviClan using credentials from .env."""
@@ -39,8 +86,7 @@ def login(driver):
         ActionChains(driver).send_keys(PASSWORD).perform()
         WebDriverWait(driver, 10).until(EC.element_to_be_clickable(
             (By.XPATH, "//button[contains(text(),'Connexion')]"))).click()
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located(
-            (By.XPATH, "//a[contains(@href, '/dashboard/download-lists')]")))
+        WebDriverWait(driver, 15).until(EC.presence_of_element_located(DOWNLOAD_LISTS_LINK_LOCATOR))
         print("✅ Logged in successfully.")
     except Exception as e:
         print("❌ Login failed:", e)
@@ -66,11 +112,67 @@ def ensure_playlist_exists(driver, playlist_name):
         print(f"➕ Playlist '{playlist_name}' not found.")
         input(f"🔧 Create playlist '{playlist_name}' manually, then press Enter to continue...")
 
+# === LIBRARY PAGE ===
+def open_library(driver):
+    """Loads the library page; its search box is then reused for every track."""
+    driver.get(f"{FUVI_URL}/dashboard/library")
+    # Let the default rows render, so the first search can tell them apart from its own results
+    try:
+        WebDriverWait(driver, 10, ignored_exceptions=(StaleElementReferenceException,)).until(rendered_result_rows)
+    except TimeoutException:
+        pass  # Empty library view: any rows that show up later are search results
+
+def rendered_result_rows(driver):
+    """Returns the search result rows once the first one has rendered its text, else False."""
+    rows = driver.find_elements(*ROW_LOCATOR)
+    return rows if rows and rows[0].text.strip() else False
+
+def results_replaced(previous_row, previous_text):
+    """
+    Wait condition: the rendered result rows once they differ from the ones shown before the search,
+    i.e. the old first row was replaced (went stale) or now shows different text.
+    """
+    def condition(driver):
+        rows = rendered_result_rows(driver)
+        if not rows:
+            return False
+        if previous_row is None or EC.staleness_of(previous_row)(driver):
+            return rows
+        return rows if rows[0].text.strip() != previous_text else False
+    return condition
+
 # === TEXT UTILS ===
+_COUNTRY_TAG_RE = re.compile(r'\((ofc|be|uk|us|fr|it|ca|au|de)\)', re.IGNORECASE)
+_TRAILING_BRACKETS_RE = re.compile(r'\s*\[[^\]]+\]\s*$')
+_NEUTRAL_SUFFIXES = (
+    r'(?:20\d{2}\s*)?(12[\'"]?\s*version|original (mix|version)|extended (mix|rework)|club mix'
+    r'|extended club mix|radio edit|edit|dub mix|version|rework|remaster(ed)?|mono|stereo)'
+)
+# One pass for the suffix with or without parenthesis; the bare form keeps \b so e.g. "Credit" is not cut to "Cr"
+_NEUTRAL_SUFFIX_RE = re.compile(
+    r'\s*(?:\((' + _NEUTRAL_SUFFIXES + r')\)|\b(' + _NEUTRAL_SUFFIXES + r')\b)\s*$', re.I
+)
+_AND_SYMBOL_RE = re.compile(r'\s*[\&\+]\s*')
+_EXTENDED_REMIX_RE = re.compile(r'\bextended remix\b', re.I)
+_REMIX_RE = re.compile(r'\bremix\b', re.I)
+_FEAT_RE = re.compile(r'(?i)\b(feat|ft|featuring)\b')
+# After the ASCII fold, [^\w\s] is a fixed character set: delete it with str.translate instead of a regex
+_NON_WORD_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c == '_' or c.isspace())
+))
+_REMIX_PAREN_RE = re.compile(r'\((.+? remix)\)', re.I)
+_REMIX_WORD_RE = re.compile(r'remix', re.I)
+_REMIXER_SPLIT_RE = re.compile(r'\s*,\s*|\s+and\s+|\s*&\s*|\s*\+\s*')
+
 def sanitize_artist_name(name):
     """Removes country tags from artist names."""
-    return re.sub(r'\((ofc|be|uk|us|fr|it|ca|au|de)\)', '', name, flags=re.IGNORECASE).strip()
+    return _COUNTRY_TAG_RE.sub('', name).strip()
+
+def _collapse(text: str) -> str:
+    """Drop non-word characters, collapse whitespace and lowercase ASCII text using C-level str methods."""
+    return ' '.join(text.translate(_NON_WORD_TABLE).split()).lower()
 
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     """
     Robust normalization:
@@ -78,72 +180,64 @@ def normalize_text(text: str) -> str:
     - Standardizes 'remix', 'extended remix', '&', '+'
     - Converts to ASCII, lowercases, strips punctuation and whitespace
     """
-    t = re.sub(r'\s*\[[^\]]+\]\s*$', '', text)
+    t = _TRAILING_BRACKETS_RE.sub('', text)
         # Remove neutral suffixes with or without parenthesis, including years and "rework"
-    t = re.sub(
-        r'\s*\(((?:20\d{2}\s*)?(12[\'"]?\s*version|original (mix|version)|extended (mix|rework)|club mix|extended club mix|radio edit|edit|dub mix|version|rework|remaster(ed)?|mono|stereo))\)\s*$',
-        '', t, flags=re.I)
-    t = re.sub(
-        r'\b((?:20\d{2}\s*)?(12[\'"]?\s*version|original (mix|version)|extended (mix|rework)|club mix|extended club mix|radio edit|edit|dub mix|version|rework|remaster(ed)?|mono|stereo))\b\s*$',
-        '', t, flags=re.I)
-
-    t = re.sub(r'\((ofc|be|uk|us|fr|it|ca|au|de)\)', '', t, flags=re.IGNORECASE)
-    t = re.sub(r'\s*[\&\+]\s*', ' and ', t)
-    t = re.sub(r'\bextended remix\b', 'remix', t, flags=re.I)
-    t = re.sub(r'\bremix\b', 'remix', t, flags=re.I)
-    t = unidecode.unidecode(t)
-    t = re.sub(r'(?i)\b(feat|ft|featuring)\b', '', t)
+    t = _NEUTRAL_SUFFIX_RE.sub('', t)
+
+    t = _COUNTRY_TAG_RE.sub('', t)
+    t = _AND_SYMBOL_RE.sub(' and ', t)
+    t = _EXTENDED_REMIX_RE.sub('remix', t)
+    t = _REMIX_RE.sub('remix', t)
+    t = anyascii(t)
+    t = _FEAT_RE.sub('', t)
     t = t.replace('&', 'and')
-    t = re.sub(r'[^\w\s]', '', t)
-    t = re.sub(r'\s+', ' ', t)
-    return t.lower().strip()
+    return _collapse(t)
 
 def extract_remixers_from_title(title):
     """
     Extracts remixer(s) from titles like '(X Remix)' (X can include multiple names).
     """
-    m = re.search(r'\((.+? remix)\)', title, flags=re.I)
+    m = _REMIX_PAREN_RE.search(title)
     if not m:
         return []
     remixers = m.group(1)
-    remixers = re.sub(r'remix', '', remixers, flags=re.I)
-    remixers = re.split(r'\s*,\s*|\s+and\s+|\s*&\s*|\s*\+\s*', remixers)
+    remixers = _REMIX_WORD_RE.sub('', remixers)
+    remixers = _REMIXER_SPLIT_RE.split(remixers)
     return [r.strip() for r in remixers if r.strip()]
 
-def generate_artist_permutations(artist_list):
-    """Generates all permutations of an artist list as comma-separated strings."""
-    if not artist_list:
-        return [""]
-    if len(artist_list) == 1:
-        return [artist_list[0].strip()]
-    return [", ".join(p) for p in itertools.permutations([a.strip() for a in artist_list])]
-
 # === MAIN TRACK LOGIC ===
 def search_and_add_track(driver, track_name, playlist_name, verbose=True):
     print(f"🔍 Scanning for: {track_name}")
 
     try:
-        driver.get(f"{FUVI_URL}/dashboard/library")
-
-        search_input = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "topbar-search"))
-        )
-        search_input.clear()
-        search_input.send_keys(track_name)
-        search_input.send_keys(Keys.RETURN)
-
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((
-                By.XPATH,
-                "//div[@role='rowgroup' and contains(@class, 'w-full')]/div[@role='row']"
-            ))
-        )
-        time.sleep(5)
+        previous_row, previous_text = None, ""
+        if SEARCH_URL_PARAM:
+            # Fresh page load, nothing left over from the previous search
+            driver.get(f"{FUVI_URL}/dashboard/library?{urlencode({SEARCH_URL_PARAM: track_name})}")
+        else:
+            search_input = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable(SEARCH_INPUT_LOCATOR)
+            )
+            # Remember what is on screen now, to recognize when the new results have replaced it
+            try:
+                previous_rows = rendered_result_rows(driver)
+                if previous_rows:
+                    previous_row, previous_text = previous_rows[0], previous_rows[0].text.strip()
+            except StaleElementReferenceException:
+                pass  # Rows were re-rendering: accept the first rendered rows instead
+            # Select all, release CONTROL (Keys.NULL), replace and submit in a single WebDriver call
+            search_input.send_keys(Keys.CONTROL, 'a', Keys.NULL, Keys.DELETE, track_name, Keys.RETURN)
 
-        result_blocks = driver.find_elements(
-            By.XPATH,
-            "//div[@role='rowgroup' and contains(@class, 'w-full')]/div[@role='row']"
-        )
+        try:
+            result_blocks = WebDriverWait(
+                driver, 20, ignored_exceptions=(StaleElementReferenceException,)
+            ).until(results_replaced(previous_row, previous_text))
+        except TimeoutException:
+            # Nothing changed within the full wait (e.g. the new top result is the same row as before):
+            # read whatever has rendered
+            result_blocks = rendered_result_rows(driver)
+            if not result_blocks:
+                raise
 
         # Parse track for matching
         target_artists = track_name.split(" - ")[0] if " - " in track_name else ""
@@ -153,33 +247,25 @@ def search_and_add_track(driver, track_name, playlist_name, verbose=True):
         base_artists_list = [a.strip() for a in target_artists.split(",")] if target_artists else []
         full_artist_list = base_artists_list + [r for r in remixers if r.lower() not in [a.lower() for a in base_artists_list]]
 
-        perms_base = generate_artist_permutations(base_artists_list)
-        perms_with_remixers = generate_artist_permutations(full_artist_list)
-        all_perms = set(perms_base + perms_with_remixers)
-
-        search_variants = [
-            normalize_text(f"{perm} - {target_title}")
-            for perm in all_perms
-        ]
+        # token_sort_ratio sorts tokens before comparing, so artist order doesn't matter
+        search_variants = list(dict.fromkeys(
+            normalize_text(f"{', '.join(artist_list)} - {target_title}")
+            for artist_list in (base_artists_list, full_artist_list)
+        ))
 
         best_match = None
         best_score = 0
 
         for idx, block in enumerate(result_blocks[:3]):
             try:
-                title_el = block.find_element(By.XPATH, ".//span[contains(@class, 'h3')]//a")
+                title_el = block.find_element(*RESULT_TITLE_LOCATOR)
                 title = title_el.text.strip()
-                artists_el = block.find_elements(By.XPATH, ".//ul[contains(@class, 'list_virgule')]//a")
+                artists_el = block.find_elements(*RESULT_ARTISTS_LOCATOR)
                 artists = ", ".join(sanitize_artist_name(a.text.strip()) for a in artists_el)
                 full_title = f"{artists} - {title}"
                 normalized_result = normalize_text(full_title)
 
-                candidate_scores = []
-                for variant in search_variants:
-                    score = SequenceMatcher(None, variant, normalized_result).ratio()
-                    candidate_scores.append((variant, score))
-
-                best_variant, max_score = max(candidate_scores, key=lambda x: x[1])
+                max_score = process.extractOne(normalized_result, search_variants, scorer=fuzz.token_sort_ratio)[1]
 
                 if verbose:
                     print(f"🎵 #{idx+1}: {full_title} (score: {round(max_score, 2)})")
@@ -188,6 +274,10 @@ def search_and_add_track(driver, track_name, playlist_name, verbose=True):
                     best_score = max_score
                     best_match = block
 
+                # Near-certain match: skip reading (and scoring) the remaining rows
+                if max_score >= EARLY_ACCEPT_SCORE:
+                    break
+
             except Exception as e:
                 print(f"⚠️ Error reading result #{idx+1}: {e}")
 
@@ -197,69 +287,99 @@ def search_and_add_track(driver, track_name, playlist_name, verbose=True):
 
         # ✅ Match found — Add to playlist
         try:
-            add_btn = best_match.find_element(
-                By.XPATH,
-                ".//button[contains(@aria-label, 'Ajouter') and contains(@aria-label, 'MP3')]"
-            )
+            add_btn = best_match.find_element(*ADD_MP3_BUTTON_LOCATOR)
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'})", add_btn)
             add_btn.click()
 
             WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'modal')]"))
+                EC.presence_of_element_located(MODAL_LOCATOR)
             )
 
-            playlist_items = driver.find_elements(By.XPATH, "//li[contains(@class, 'cursor-pointer')]")
+            playlist_items = driver.find_elements(*PLAYLIST_ITEM_LOCATOR)
 
             for li in playlist_items:
                 try:
                     label_text = li.text.strip().split("\n")[0]
                     if label_text.strip().lower() == playlist_name.lower():
                         driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'})", li)
-                        time.sleep(0.5)
-                        li.click()
+                        WebDriverWait(driver, 5).until(EC.element_to_be_clickable(li)).click()
                         print("✅ Track added to playlist.")
                         return True
                 except Exception as e:
                     print(f"⚠️ Skipping playlist item due to error: {e}")
 
             print("❌ Could not find the playlist item in modal.")
+            open_library(driver)
             return False
 
         except Exception as e:
             print(f"⚠️ Couldn't add to playlist: {e}")
+            open_library(driver)
             return False
 
     except Exception as e:
         print(f"❌ Search failed for {track_name}: {e}")
+        open_library(driver)
         return False
 
 # === MAIN LOOP ===
+def process_track(track):
+    """Searches and adds one track on a free browser session, returning the session afterwards."""
+    driver = _session_pool.get()
+    try:
+        return search_and_add_track(driver, track, PLAYLIST_NAME)
+    finally:
+        _session_pool.put(driver)
+
 def main():
     driver = create_driver()
     login(driver)
     ensure_playlist_exists(driver, PLAYLIST_NAME)
+    driver.quit()
 
     with open(TRACK_LIST_FILE, "r", encoding="utf-8") as f:
         tracks = [line.strip() for line in f if line.strip()]
 
-    added, not_found = [], []
-
-    for track in tracks:
-        if search_and_add_track(driver, track, PLAYLIST_NAME):
-            added.append(track)
-        else:
-            not_found.append(track)
-
-    with open("logs/added_tracks.txt", "w", encoding="utf-8") as f:
-        f.writelines(f"{track}\n" for track in added)
-
-    with open("logs/not_found_tracks.txt", "w", encoding="utf-8") as f:
-        f.writelines(f"{track}\n" for track in not_found)
-
-    print(f"\n📦 Done. Added: {len(added)}, Not Found: {len(not_found)}")
+    # Every track costs a browser round trip: drop duplicates and tracks added by a previous run
+    tracks = list(dict.fromkeys(tracks))
+    if os.path.exists(ADDED_TRACKS_FILE):
+        with open(ADDED_TRACKS_FILE, "r", encoding="utf-8") as f:
+            already_added = {line.strip() for line in f}
+        remaining = [track for track in tracks if track not in already_added]
+        if len(remaining) < len(tracks):
+            print(f"⏭️ Skipping {len(tracks) - len(remaining)} tracks already added in a previous run.")
+        tracks = remaining
+
+    added, not_found = 0, 0
+
+    # Line-buffered logs written as each track finishes, so a crash loses nothing already processed.
+    # Added tracks accumulate across runs; not-found tracks are all retried, so that log restarts each run.
+    with open(ADDED_TRACKS_FILE, "a", encoding="utf-8", buffering=1) as added_f, \
+            open(NOT_FOUND_TRACKS_FILE, "w", encoding="utf-8", buffering=1) as not_found_f:
+        try:
+            if tracks:
+                start_session_drivers(min(WORKERS, len(tracks)))
+            with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+                futures = {executor.submit(process_track, track): track for track in tracks}
+                for future in as_completed(futures):
+                    track = futures[future]
+                    try:
+                        was_added = future.result()
+                    except Exception as e:
+                        # Keep logging the other tracks: the pool runs them either way
+                        print(f"❌ Processing failed for {track}: {e}")
+                        was_added = False
+                    if was_added:
+                        added_f.write(f"{track}\n")
+                        added += 1
+                    else:
+                        not_found_f.write(f"{track}\n")
+                        not_found += 1
+        finally:
+            quit_session_drivers()
+
+    print(f"\n📦 Done. Added: {added}, Not Found: {not_found}")
     print("📁 Files: added_tracks.txt, not_found_tracks.txt")
-    input("🔒 Press Enter to close browser...")
-    driver.quit()
 
 if __name__ == "__main__":
     main()
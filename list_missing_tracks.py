@@ -1,91 +1,137 @@
 import os
 import re
 import argparse
-from typing import List, Tuple
-import unidecode
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+from anyascii import anyascii
 from spotipy.oauth2 import SpotifyClientCredentials
 import spotipy
-import itertools
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 from dotenv import load_dotenv
 
 # === CONFIG ===
 AUDIO_EXTENSIONS = ['.mp3', '.wav', '.flac', '.m4a', '.aiff']
+_AUDIO_EXT = tuple(AUDIO_EXTENSIONS)  # str.endswith takes a tuple
+MAX_CANDIDATES = 20  # Best-scoring local files checked per Spotify track
+ARTIST_JACCARD_ACCEPT = 0.5  # Artist sets overlapping at least this much match without fuzzy scoring
+
+# === PATTERNS ===
+_COUNTRY_TAG_RE = re.compile(r'\((ofc|be|uk|us|fr|it|ca|au|de)\)', re.IGNORECASE)
+# feat./country-tag removal for normalize_text in one scan; neither removal can create a match for the other
+_NORM_STRIP_RE = re.compile(r'(?i)\b(?:feat|ft|featuring)\b|\((?:ofc|be|uk|us|fr|it|ca|au|de)\)')
+# After the ASCII fold, [^\w\s] is a fixed character set: delete it with str.translate instead of a regex
+_NON_WORD_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c == '_' or c.isspace())
+))
+_MULTI_SPACE_RE = re.compile(r'\s{2,}')
+_VERSION_PAREN_RE = re.compile(r'\((Original Mix|Extended Mix|Club Mix|Dub Mix|Version|Edit)\)', re.IGNORECASE)
+_ORIGINAL_EXTENDED_PAREN_RE = re.compile(r'\((Original Mix|Extended Mix)\)', re.IGNORECASE)
+_ORIGINAL_EXTENDED_WORD_RE = re.compile(r'\b(Original Mix|Extended Mix)\b', re.IGNORECASE)
+_REMIX_PAREN_RE = re.compile(r'\((.+? Remix.*?)\)', re.IGNORECASE)
+_REMIXER_SPLIT_RE = re.compile(r' and |, | & ')
+_FILENAME_SEPARATOR_TABLE = str.maketrans('_.', '  ')
+_ARTIST_SPLIT_RE = re.compile(r',|\s&\s|\sand\s|\sft\.?\s|\sfeat\.?\s|\sfeaturing\s', re.IGNORECASE)
+_FEAT_PAREN_RE = re.compile(r'\(feat\.? ([^)]+)\)', re.IGNORECASE)
+_FEAT_ARTIST_SPLIT_RE = re.compile(r',|&|and')
+_MIX_PAREN_TAIL_RE = re.compile(r'\(([^)]+)\)$')
+_MIX_WORD_RE = re.compile(r'remix|mix|edit|version')
+_MIX_DASH_TAIL_RE = re.compile(r'-\s*([^-]+(?:remix|mix|edit|version))$', re.IGNORECASE)
+_NONMIX_PAREN_RE = re.compile(r'\((?!.*remix|edit|mix|version).*?\)', re.IGNORECASE)
+_NONMIX_DASH_TAIL_RE = re.compile(r'\s*-\s*((?!remix|edit|mix|version)[^-\n]+)$', re.IGNORECASE)
+_ANY_PAREN_RE = re.compile(r'\(.*\)')
+_COMMON_SUFFIXES = [
+    'Remix', 'Extended Mix', 'Original Mix', 'Club Mix',
+    'Radio Edit', 'Edit', 'Dub Mix', 'Version'
+]
+# No suffix ends another except "Edit"/"Radio Edit", so the leftmost match is also the first one in list order
+_COMMON_SUFFIX_RE = re.compile('(?:' + '|'.join(map(re.escape, _COMMON_SUFFIXES)) + ')$', re.IGNORECASE)
+_CANONICAL_SUFFIXES = {suffix.lower(): suffix for suffix in _COMMON_SUFFIXES}
 
 # === ARTIST & TITLE HELPERS ===
-def generate_artist_permutations(artists: List[str]) -> List[str]:
-    """Return all unique artist order permutations (comma-separated strings)."""
-    if not artists or len(artists) == 1:
-        return [", ".join(artists)]
-    perms = set(", ".join(p) for p in itertools.permutations(artists))
-    return list(perms)
+def canonical_artists(artists: List[str]) -> str:
+    """Return the normalized artist names sorted into one order-independent string."""
+    return " ".join(sorted(normalize_text(sanitize_local_artist(a)) for a in artists))
 
+@lru_cache(maxsize=16384)
 def sanitize_local_artist(artist_name: str) -> str:
     """Remove (ofc), (be), (uk), etc. from artist names."""
-    return re.sub(r'\((ofc|be|uk|us|fr|it|ca|au|de)\)', '', artist_name, flags=re.IGNORECASE).strip()
+    return _COUNTRY_TAG_RE.sub('', artist_name).strip()
+
+def _collapse(text: str) -> str:
+    """Drop non-word characters, collapse whitespace and lowercase ASCII text using C-level str methods."""
+    return ' '.join(text.translate(_NON_WORD_TABLE).split()).lower()
 
+@lru_cache(maxsize=16384)
 def normalize_text(text: str) -> str:
     """Remove diacritics, unify feat., and strip symbols for fuzzy comparison."""
-    text = unidecode.unidecode(text)
-    text = re.sub(r'(?i)\b(feat|ft|featuring)\b', '', text)
-    text = text.replace('&', 'and')
-    text = re.sub(r'\((ofc|be|uk|us|fr|it|ca|au|de)\)', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'[^\w\s]', '', text)
-    return re.sub(r'\s+', ' ', text).lower().strip()
+    return _collapse(_NORM_STRIP_RE.sub('', anyascii(text)).replace('&', 'and'))
 
 def simplify_title(title: str, artist_list: List[str] = None) -> str:
     """Strip basic version descriptors and redundant features from a title."""
-    title = re.sub(r'\((Original Mix|Extended Mix|Club Mix|Dub Mix|Version|Edit)\)', '', title, flags=re.IGNORECASE).strip()
-    if artist_list:
-        for artist in artist_list:
-            pattern = rf'(?i)\s*(feat\.?|featuring)\s+{re.escape(artist)}'
-            title = re.sub(pattern, '', title)
-    title = re.sub(r'\s{2,}', ' ', title)
+    return _simplify_title(title, tuple(artist_list) if artist_list else ())
+
+@lru_cache(maxsize=16384)
+def _simplify_title(title: str, artist_list: Tuple[str, ...]) -> str:
+    title = _VERSION_PAREN_RE.sub('', title).strip()
+    for artist in artist_list:
+        title = _feat_artist_re(artist).sub('', title)
+    title = _MULTI_SPACE_RE.sub(' ', title)
     return normalize_text(title)
 
+@lru_cache(maxsize=4096)
+def _feat_artist_re(artist: str) -> re.Pattern:
+    """Compile the pattern matching "feat. <artist>" in a title once per artist name."""
+    return re.compile(rf'(?i)\s*(feat\.?|featuring)\s+{re.escape(artist)}')
+
 def extract_artist_and_title(track_str: str) -> Tuple[List[str], str]:
     """
     Parse "Artist1, Artist2 - Title (feat. X)" into (artists: [..], title: ...), merging any (feat. ..) from title into artists.
     """
     if " - " in track_str:
         artist_part, title_part = track_str.split(" - ", 1)
-        artist_raw_parts = re.split(r',|\s&\s|\sand\s|\sft\.?\s|\sfeat\.?\s|\sfeaturing\s', artist_part, flags=re.IGNORECASE)
+        artist_raw_parts = _ARTIST_SPLIT_RE.split(artist_part)
         artists = [a.strip() for a in artist_raw_parts if a.strip()]
 
-        m = re.search(r'\(feat\.? ([^)]+)\)', title_part, re.IGNORECASE)
+        m = _FEAT_PAREN_RE.search(title_part)
         if m:
-            feat_artists = [a.strip() for a in re.split(r',|&|and', m.group(1))]
+            feat_artists = [a.strip() for a in _FEAT_ARTIST_SPLIT_RE.split(m.group(1))]
             artists += [a for a in feat_artists if a not in artists]
-            title_part = re.sub(r'\(feat\.? [^)]+\)', '', title_part, flags=re.IGNORECASE).strip()
+            title_part = _FEAT_PAREN_RE.sub('', title_part).strip()
 
         return artists, title_part.strip()
     return [], track_str.strip()
 
+@lru_cache(maxsize=16384)
 def extract_mix_type(title: str) -> str:
     """
     Return mix/remix/version info (e.g. 'Original Mix', 'Remix', 'Club Mix', etc.) from a title, lowercase, else ''.
     """
-    m = re.search(r'\(([^)]+)\)$', title)
+    m = _MIX_PAREN_TAIL_RE.search(title)
     if m:
         mix = m.group(1).strip().lower()
-        if re.search(r'remix|mix|edit|version', mix):
+        if _MIX_WORD_RE.search(mix):
             return mix
-    m2 = re.search(r'-\s*([^-]+(?:remix|mix|edit|version))$', title, re.I)
+    m2 = _MIX_DASH_TAIL_RE.search(title)
     if m2:
         return m2.group(1).strip().lower()
     return ''
 
+@lru_cache(maxsize=16384)
 def strip_nonmix_subtitles(title: str) -> str:
     """
     Remove parentheticals and trailing hyphen subtitles NOT being remix/edit/mix/version.
     """
-    t = re.sub(r'\((?!.*remix|edit|mix|version).*?\)', '', title, flags=re.I)
-    t = re.sub(r'\s*-\s*((?!remix|edit|mix|version)[^-\n]+)$', '', t, flags=re.I)
+    t = _NONMIX_PAREN_RE.sub('', title)
+    t = _NONMIX_DASH_TAIL_RE.sub('', t)
     return t.strip()
 
+@lru_cache(maxsize=16384)
 def clean_filename(name: str) -> str:
     """Replace underscores/dots with spaces."""
-    return re.sub(r'[_\.]', ' ', name).strip()
+    return name.translate(_FILENAME_SEPARATOR_TABLE).strip()
 
 # === MATCHING LOGIC ===
 def is_mix_type_conflict(mt1, mt2):
@@ -125,32 +171,70 @@ def is_mix_type_conflict(mt1, mt2):
         return False
     return mt1 != mt2
 
-def get_local_track_names(folder_path: str) -> List[Tuple[str, str]]:
-    tracks = []
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in AUDIO_EXTENSIONS):
-                name, _ = os.path.splitext(file)
-                formatted = clean_filename(name)
-                tracks.append((formatted, normalize_text(formatted)))
-    return tracks
+def _iter_audio_files(folder_path: str):
+    """Yield audio file names under folder_path, top-down like os.walk, without per-file stat calls."""
+    pending = [folder_path]
+    while pending:
+        subfolders = []
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif entry.name.lower().endswith(_AUDIO_EXT) and entry.is_file():
+                        yield entry.name
+        except OSError:
+            continue
+        # Reversed so the first subfolder is popped (and fully walked) first
+        pending.extend(reversed(subfolders))
+
+@dataclass
+class TrackColumns:
+    """
+    Tracks stored as parallel columns (one entry per track, same index in every column):
+    formatted names plus the match features from extract_match_features, built once per track.
+    """
+    original: np.ndarray  # numpy object array, so unmatched names can be picked with a boolean mask
+    title_norm: List[str]
+    mix_type: List[str]
+    artists: List[str]  # canonical (sorted) artist string
+    key: List[str]
+    artist_set: List[FrozenSet[str]]
+
+    @classmethod
+    def from_names(cls, names: List[str]) -> 'TrackColumns':
+        features = list(map(extract_match_features, names))
+        columns = [list(column) for column in zip(*features)] if features else [[] for _ in range(5)]
+        return cls(np.array(names, dtype=object), *columns)
+
+    def __len__(self) -> int:
+        return len(self.original)
+
+def get_local_track_names(folder_path: str) -> TrackColumns:
+    """Return the formatted names of local audio files with their match features."""
+    # Walk the folder first, then normalize every name in one CPU-only pass
+    file_names = list(_iter_audio_files(folder_path))
+    return TrackColumns.from_names([clean_filename(os.path.splitext(file)[0]) for file in file_names])
 
 def format_spotify_track(artists: List[str], title: str) -> str:
     """
     Format a Spotify API track into "Artist1, Artist2 - Title (Remix)" for consistent local matching.
     """
     # Remove (Original Mix) and (Extended Mix)
-    title_clean = re.sub(r'\((Original Mix|Extended Mix)\)', '', title, flags=re.IGNORECASE)
-    title_clean = re.sub(r'\b(Original Mix|Extended Mix)\b', '', title_clean, flags=re.IGNORECASE)
-    title_clean = re.sub(r'\s*-\s*$', '', title_clean)
-    title_clean = re.sub(r'\s{2,}', ' ', title_clean).strip()
+    title_clean = _ORIGINAL_EXTENDED_PAREN_RE.sub('', title)
+    title_clean = _ORIGINAL_EXTENDED_WORD_RE.sub('', title_clean)
+    # Drop a dangling " - " left behind by the removals above
+    stripped = title_clean.rstrip()
+    if stripped.endswith('-'):
+        title_clean = stripped[:-1].rstrip()
+    title_clean = _MULTI_SPACE_RE.sub(' ', title_clean).strip()
     if ' - ' in title_clean and '(' not in title_clean:
         title_parts = title_clean.split(' - ', 1)
         title_clean = f"{title_parts[0].strip()} ({title_parts[1].strip()})"
-    remix_match = re.search(r'\((.+? Remix.*?)\)', title_clean, flags=re.IGNORECASE)
+    remix_match = _REMIX_PAREN_RE.search(title_clean)
     if remix_match:
         remixers_raw = remix_match.group(1).replace(' Remix', '').strip()
-        remixers_split = re.split(r' and |, | & ', remixers_raw)
+        remixers_split = _REMIXER_SPLIT_RE.split(remixers_raw)
         remixers_list = [normalize_text(r) for r in remixers_split]
     else:
         remixers_list = []
@@ -165,63 +249,158 @@ def format_spotify_track(artists: List[str], title: str) -> str:
 def fetch_spotify_playlist_tracks(playlist_url: str, client_id: str, client_secret: str) -> List[str]:
     sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(client_id=client_id, client_secret=client_secret))
     playlist_id = playlist_url.split("/")[-1].split("?")[0]
-    results = sp.playlist_items(playlist_id)
     tracks = []
-    while results:
-        for item in results['items']:
+    offset = 0
+    while True:
+        # Only request the fields used below; full track objects are mostly album art and market lists.
+        # Paging by offset (rather than sp.next) keeps the fields filter on every page.
+        results = sp.playlist_items(
+            playlist_id, fields='items(track(name,artists(name))),next',
+            limit=100, offset=offset, additional_types=('track',)
+        )
+        items = results['items']
+        for item in items:
             track = item['track']
             if track:
                 artists = [a['name'] for a in track['artists']]
                 title = track['name']
                 formatted = format_spotify_track(artists, title)
                 tracks.append(formatted)
-        results = sp.next(results) if results['next'] else None
+        if not results['next'] or not items:
+            break
+        offset += len(items)
     return sorted(tracks, key=str.lower)
 
-def find_matches(spotify_tracks: List[str], local_tracks: List[Tuple[str, str]], threshold: int = 90):
-    matched = []
-    missing = []
-    matched_locals = set()
-    for sp_track in spotify_tracks:
-        sp_artists, sp_title = extract_artist_and_title(sp_track)
-        sp_title_for_match = strip_nonmix_subtitles(sp_title)
-        sp_title_normalized = simplify_title(sp_title_for_match, sp_artists)
-        sp_mix_type = extract_mix_type(sp_title)
-        sp_artist_perms = generate_artist_permutations([sanitize_local_artist(a) for a in sp_artists])
-        sp_artist_norms = [normalize_text(perm) for perm in sp_artist_perms]
-        found = False
-        for local_original, local_normalized in local_tracks:
-            if local_original in matched_locals:
-                continue
-            loc_artists, loc_title = extract_artist_and_title(local_original)
-            loc_title_for_match = strip_nonmix_subtitles(loc_title)
-            loc_title_normalized = simplify_title(loc_title_for_match, loc_artists)
-            loc_mix_type = extract_mix_type(loc_title)
-            loc_artist_perms = generate_artist_permutations([sanitize_local_artist(a) for a in loc_artists])
-            loc_artist_norms = [normalize_text(perm) for perm in loc_artist_perms]
-            if is_mix_type_conflict(sp_mix_type, loc_mix_type):
-                continue
-            best_artist_score = 0
-            for sp_norm in sp_artist_norms:
-                for loc_norm in loc_artist_norms:
-                    score = fuzz.partial_ratio(sp_norm, loc_norm)
-                    if score > best_artist_score:
-                        best_artist_score = score
-            title_score = fuzz.partial_ratio(sp_title_normalized, loc_title_normalized)
-            if best_artist_score >= threshold and title_score >= threshold:
-                matched.append(sp_track)
-                matched_locals.add(local_original)
-                found = True
-                break
-        if not found:
-            missing.append(sp_track)
-    unmatched_local = [original for original, _ in local_tracks if original not in matched_locals]
+@lru_cache(maxsize=16384)
+def extract_match_features(track_str: str) -> Tuple[str, str, str, str, FrozenSet[str]]:
+    """
+    Return (normalized title, mix type, canonical artists, match key, artist set) used to match a track.
+    The match key is the normalized "artists title" string scored for every (spotify, local) pair.
+    Cached: the same name often shows up more than once (copies in several folders, or a local file
+    named exactly like its Spotify track), and the result is immutable.
+    """
+    artists, title = extract_artist_and_title(track_str)
+    title_for_match = strip_nonmix_subtitles(title)
+    title_normalized = simplify_title(title_for_match, artists)
+    mix_type = extract_mix_type(title)
+    artists_canonical = canonical_artists(artists)
+    key = f"{artists_canonical} {title_normalized}".strip()
+    artist_set = frozenset(normalize_text(sanitize_local_artist(a)) for a in artists)
+    return title_normalized, mix_type, artists_canonical, key, artist_set
+
+def artists_and_title_match(sp_title: str, sp_artists: str, sp_artist_set: FrozenSet[str],
+                            loc_title: str, loc_artists: str, loc_artist_set: FrozenSet[str], threshold: int) -> bool:
+    """Check that both the title and the (order-independent) artists reach the threshold."""
+    # File names often carry extra title text ("Title Extended Mix"), so a longer local title only has to
+    # contain the Spotify one; a shorter one must match as a whole, or "Signal Soul" would match "Soul"
+    title_scorer = fuzz.partial_ratio if len(loc_title) >= len(sp_title) else fuzz.token_sort_ratio
+    if not title_scorer(sp_title, loc_title, score_cutoff=threshold):
+        return False
+    # No artists on either side (no " - " in the name, or the only artist was a stripped remixer)
+    if not sp_artists and not loc_artists:
+        return True
+    # Exact artist names usually overlap: a set intersection settles those without fuzzy scoring
+    shared = len(sp_artist_set & loc_artist_set)
+    if shared and shared / len(sp_artist_set | loc_artist_set) >= ARTIST_JACCARD_ACCEPT:
+        return True
+    # token_set_ratio ignores artist order and lets one side list extra artists, as the permutations used to
+    return bool(fuzz.token_set_ratio(sp_artists, loc_artists, score_cutoff=threshold))
+
+def _ranked_candidate_pairs(spotify: TrackColumns, local: TrackColumns,
+                            gate_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (spotify rows, local columns) of the pairs that passed the key gate, best WRatio key score first.
+    Each Spotify track keeps its MAX_CANDIDATES best pairs; ties keep playlist order, then file order.
+    """
+    rows, cols = np.nonzero(gate_scores)
+    # Only the few gated pairs get a WRatio score, used for ranking and never to reject a pair
+    rank = np.array([fuzz.WRatio(spotify.key[i], local.key[j]) for i, j in zip(rows, cols)], dtype=np.float64)
+    by_row = np.lexsort((cols, -rank, rows))
+    rows, cols, rank = rows[by_row], cols[by_row], rank[by_row]
+    keep = np.arange(len(rows)) - np.searchsorted(rows, rows) < MAX_CANDIDATES
+    rows, cols, rank = rows[keep], cols[keep], rank[keep]
+    order = np.lexsort((cols, rows, -rank))
+    return rows[order], cols[order]
+
+def _mix_conflicts(spotify: TrackColumns, local: TrackColumns, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Return is_mix_type_conflict for each (rows[k], cols[k]) pair as a boolean array.
+    Mix types are mapped to integer ids and the check runs once per distinct id pair, not once per track pair.
+    """
+    mix_ids = {mix: n for n, mix in enumerate(dict.fromkeys(spotify.mix_type + local.mix_type))}
+    mixes = list(mix_ids)
+    sp_ids = np.array([mix_ids[mix] for mix in spotify.mix_type], dtype=np.int64)
+    loc_ids = np.array([mix_ids[mix] for mix in local.mix_type], dtype=np.int64)
+    pair_ids, inverse = np.unique(sp_ids[rows] * len(mixes) + loc_ids[cols], return_inverse=True)
+    table = np.array([is_mix_type_conflict(mixes[p // len(mixes)], mixes[p % len(mixes)]) for p in pair_ids], dtype=bool)
+    return table[inverse.reshape(-1)]
+
+def _pair_matches(spotify: TrackColumns, i: int, local: TrackColumns, j: int, threshold: int) -> bool:
+    """Check title and artists of Spotify track i against local track j."""
+    return artists_and_title_match(
+        spotify.title_norm[i], spotify.artists[i], spotify.artist_set[i],
+        local.title_norm[j], local.artists[j], local.artist_set[j], threshold
+    )
+
+def find_matches(spotify_tracks: List[str], local_tracks: TrackColumns, threshold: int = 90, workers: int = -1):
+    """
+    Return (matched, missing, unmatched local) names.
+
+    A local file listing fewer artists than Spotify still matches:
+    >>> find_matches(["Artist X, Artist Y - Tune"], TrackColumns.from_names(["Artist X - Tune"]))[0]
+    ['Artist X, Artist Y - Tune']
+    >>> find_matches(["Artist X - Title (feat. Singer Y)"], TrackColumns.from_names(["Artist X - Title"]))[0]
+    ['Artist X - Title (feat. Singer Y)']
+
+    Names without artists on both sides match on the title alone:
+    >>> find_matches(["NoDash"], TrackColumns.from_names(["NoDash"]))[0]
+    ['NoDash']
+    >>> sp_track = format_spotify_track(['Dixon'], 'Song - Dixon Remix')
+    >>> find_matches([sp_track], TrackColumns.from_names([sp_track]))[0] == [sp_track]
+    True
+    """
+    # Preprocess every Spotify track once, then gate all (spotify, local) match keys in C.
+    # The gate is only a loose prefilter: token_set_ratio does not penalize one key being a subset of the other
+    # (e.g. fewer artists on the file), and artists_and_title_match makes the actual threshold decision.
+    spotify = TrackColumns.from_names(spotify_tracks)
+    if len(spotify) and len(local_tracks):
+        # rapidfuzz releases the GIL and splits the matrix rows over `workers` threads (-1 = all cores)
+        gate_scores = process.cdist(
+            spotify.key, local_tracks.key,
+            scorer=fuzz.token_set_ratio, dtype=np.uint8, score_cutoff=threshold, workers=workers
+        )
+    else:
+        gate_scores = np.zeros((len(spotify), len(local_tracks)), dtype=np.uint8)
+    # Greedy on descending key score over all pairs: a file goes to the Spotify track it fits best,
+    # not to whichever track happens to come first in the playlist.
+    matched_spotify = np.zeros(len(spotify), dtype=bool)
+    matched_locals = np.zeros(len(local_tracks), dtype=bool)
+    rows, cols = _ranked_candidate_pairs(spotify, local_tracks, gate_scores)
+    if len(rows):
+        compatible = ~_mix_conflicts(spotify, local_tracks, rows, cols)
+        rows, cols = rows[compatible], cols[compatible]
+    for i, j in zip(rows, cols):
+        if matched_spotify[i] or matched_locals[j]:
+            continue
+        if _pair_matches(spotify, i, local_tracks, j, threshold):
+            matched_spotify[i] = matched_locals[j] = True
+    matched = [track for track, found in zip(spotify_tracks, matched_spotify) if found]
+    missing = [track for track, found in zip(spotify_tracks, matched_spotify) if not found]
+    unmatched_local = local_tracks.original[~matched_locals].tolist()
     return matched, missing, unmatched_local
 
-def save_list_to_file(data: List[str], path: str, label: str):
+def clear_match_caches():
+    """Release the memoized string helpers once matching is done."""
+    for cached in (sanitize_local_artist, normalize_text, _simplify_title, _feat_artist_re, extract_mix_type,
+                   strip_nonmix_subtitles, clean_filename, extract_match_features):
+        cached.cache_clear()
+
+def save_list_to_file(data: List[str], path: str, label: str, presorted: bool = False):
+    """Write one item per line, sorted case-insensitively unless the caller already did."""
+    if not presorted:
+        data = sorted(data, key=str.lower)
     with open(path, "w", encoding="utf-8") as f:
-        for item in sorted(data, key=str.lower):
-            f.write(item.strip() + "\n")
+        f.write(''.join(item.strip() + "\n" for item in data))
     print(f"📄 {label} saved to {path}")
 
 def format_local_track_name(raw_name: str) -> str:
@@ -231,15 +410,10 @@ def format_local_track_name(raw_name: str) -> str:
         artists, title = raw_name.split(" - ", 1)
         artists = artists.strip()
         title = title.strip()
-        common_suffixes = [
-            'Remix', 'Extended Mix', 'Original Mix', 'Club Mix',
-            'Radio Edit', 'Edit', 'Dub Mix', 'Version'
-        ]
-        if not re.search(r'\(.*\)', title):
-            for suffix in common_suffixes:
-                if title.lower().endswith(suffix.lower()):
-                    title = re.sub(rf'{suffix}$', f'({suffix})', title, flags=re.IGNORECASE)
-                    break
+        if not _ANY_PAREN_RE.search(title):
+            m = _COMMON_SUFFIX_RE.search(title)
+            if m:
+                title = f"{title[:m.start()]}({_CANONICAL_SUFFIXES[m.group().lower()]})"
         return f"{artists} - {title}"
     return raw_name.strip()
 
@@ -250,6 +424,7 @@ def main():
     parser.add_argument('--folder_path', help='Path to local folder', default=None)
     parser.add_argument('--client_id', help='Spotify Client ID (optional if set in .env)')
     parser.add_argument('--client_secret', help='Spotify Client Secret (optional if set in .env)')
+    parser.add_argument('--workers', type=int, default=-1, help='Threads used for fuzzy matching (-1 = all cores)')
     args = parser.parse_args()
     client_id = args.client_id or os.getenv("SPOTIPY_CLIENT_ID")
     client_secret = args.client_secret or os.getenv("SPOTIPY_CLIENT_SECRET")
@@ -257,18 +432,24 @@ def main():
         print("❌ Spotify credentials missing. Provide via CLI or set in .env")
         exit(1)
     print("🔗 Fetching playlist...")
-    spotify_tracks = fetch_spotify_playlist_tracks(args.spotify_url, client_id, client_secret)
+    # spotipy blocks on each page request: scan the local folder while the playlist downloads
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        spotify_future = executor.submit(fetch_spotify_playlist_tracks, args.spotify_url, client_id, client_secret)
+        if args.folder_path:
+            print("📂 Reading local files...")
+            local_tracks = get_local_track_names(args.folder_path)
+        spotify_tracks = spotify_future.result()
     print(f"🎵 Found {len(spotify_tracks)} tracks.")
     if args.folder_path:
-        print("📂 Reading local files...")
-        local_tracks = get_local_track_names(args.folder_path)
         print(f"📁 {len(local_tracks)} local files found.")
         print("🧠 Matching tracks...")
-        matched, missing, unmatched_local = find_matches(spotify_tracks, local_tracks)
+        matched, missing, unmatched_local = find_matches(spotify_tracks, local_tracks, workers=args.workers)
         formatted_unmatched = [format_local_track_name(name) for name in unmatched_local]
+        clear_match_caches()
         os.makedirs("logs", exist_ok=True)
-        save_list_to_file(missing, "logs/missing_tracks.txt", "Missing tracks")
-        save_list_to_file(matched, "logs/matched_tracks.txt", "Matched tracks")
+        # Both keep the playlist order, which fetch_spotify_playlist_tracks already sorted
+        save_list_to_file(missing, "logs/missing_tracks.txt", "Missing tracks", presorted=True)
+        save_list_to_file(matched, "logs/matched_tracks.txt", "Matched tracks", presorted=True)
         save_list_to_file(formatted_unmatched, "logs/unmatched_local.txt", "Unmatched local files")
         print(f"\n✅ {len(matched)} matched")
         print(f"❌ {len(missing)} missing")